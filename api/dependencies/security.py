@@ -11,10 +11,8 @@ import hashlib
 from typing import Annotated, Dict, Optional
 
 from fastapi import Cookie, Depends, Header, HTTPException
-from jose import jwt
 
-from core import config
-from utils import postgres_utils
+from utils import jwt_utils, postgres_utils
 
 
 async def verify_user_access(
@@ -46,11 +44,7 @@ async def verify_user_access(
     # Check JWT authentication
     if access_token:
         try:
-            payload = jwt.decode(
-                access_token,
-                config.settings.jwt_secret_key,
-                algorithms=[config.settings.jwt_algorithm],
-            )
+            payload = jwt_utils.decode_token(access_token)
             username = payload.get("sub")
             if username:
                 user = postgres_utils.get_user_by_username(username=username)
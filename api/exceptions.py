@@ -20,7 +20,7 @@ logger = logging_utils.get_logger("cytolens.api.exceptions")
 
 async def validation_exception_handler(request: Request, exc: ValidationError):
     """Handle Pydantic validation errors"""
-    logger.warning(f"Validation error at {request.method} {request.url.path}")
+    logger.warning("Validation error at %s %s", request.method, request.url.path)
     return JSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={"detail": exc.errors()},
@@ -30,7 +30,10 @@ async def validation_exception_handler(request: Request, exc: ValidationError):
 async def jwt_exception_handler(request: Request, exc: JWTError):
     """Handle JWT token errors"""
     logger.warning(
-        f"JWT auth failed at {request.method} {request.url.path} from {request.client.host}"
+        "JWT auth failed at %s %s from %s",
+        request.method,
+        request.url.path,
+        request.client.host,
     )
     return JSONResponse(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -40,7 +43,7 @@ async def jwt_exception_handler(request: Request, exc: JWTError):
 
 async def value_error_handler(request: Request, exc: ValueError):
     """Handle ValueError from services (e.g., invalid credentials, duplicate users)"""
-    logger.warning(f"Client error at {request.method} {request.url.path}: {str(exc)}")
+    logger.warning("Client error at %s %s: %s", request.method, request.url.path, exc)
     return JSONResponse(
         status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)}
     )
@@ -49,7 +52,10 @@ async def value_error_handler(request: Request, exc: ValueError):
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected errors"""
     logger.error(
-        f"Server error at {request.method} {request.url.path}: {str(exc)}",
+        "Server error at %s %s: %s",
+        request.method,
+        request.url.path,
+        exc,
         exc_info=True,  # This logs the full stack trace
     )
     return JSONResponse(
@@ -10,7 +10,7 @@ Slide management routes for upload, download, and deletion
 
 from typing import Dict, List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from api.dependencies.security import verify_user_access
 from api.schemas import inference as inference_schemas
@@ -30,6 +30,7 @@ from api.schemas.slides import (
     UpdateSlideResponse,
 )
 from api.services import slides as slides_service
+from core import constants
 
 router = APIRouter(
     prefix="/slides",
@@ -41,12 +42,23 @@ router = APIRouter(
 @router.get("", response_model=GetSlidesResponse)
 async def get_slides(
     current_user: Dict = Depends(verify_user_access),
+    limit: int = Query(
+        constants.Defaults.SLIDE_LIMIT,
+        ge=1,
+        le=500,
+        description="Number of slides to return",
+    ),
+    offset: int = Query(
+        constants.Defaults.SLIDE_OFFSET, ge=0, description="Number of slides to skip"
+    ),
 ) -> GetSlidesResponse:
     """
-    Get all slides for the authenticated user.
+    Get slides for the authenticated user, most recent first.
     Requires authentication via API key or JWT token.
     """
-    slides = await slides_service.get_slides(user_id=current_user["id"])
+    slides = await slides_service.get_slides(
+        user_id=current_user["id"], limit=limit, offset=offset
+    )
     return GetSlidesResponse(slides=slides)
 
 
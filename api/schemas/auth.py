@@ -8,6 +8,7 @@ via any medium, is strictly prohibited.
 Authentication schemas for user registration, login, and API key management
 """
 
+from datetime import datetime
 from typing import Optional
 
 from pydantic import BaseModel, field_validator
@@ -67,7 +68,7 @@ class LogoutResponse(BaseModel):
 
 class CreateApiKeyRequest(BaseModel):
     name: str = "default"
-    expires_at: Optional[str] = None
+    expires_at: Optional[datetime] = None
 
 
 class CreateApiKeyResponse(BaseModel):
@@ -8,6 +8,7 @@ via any medium, is strictly prohibited.
 Inference schemas for AI analysis task management
 """
 
+from datetime import datetime
 from typing import List, Optional
 
 from pydantic import BaseModel, Field
@@ -43,8 +44,8 @@ class TaskStatusResponse(BaseModel):
     state: str
     message: Optional[str] = None
     confidence: Optional[float] = None
-    created_at: str
-    completed_at: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
 
 
 class TaskCancelResponse(BaseModel):
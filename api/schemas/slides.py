@@ -8,6 +8,7 @@ via any medium, is strictly prohibited.
 Slide management schemas for upload, download, and deletion
 """
 
+from datetime import datetime
 from typing import List, Optional
 
 from pydantic import BaseModel, field_validator
@@ -21,7 +22,7 @@ class Slide(BaseModel):
 
     id: int
     name: str
-    created_at: str
+    created_at: datetime
     owner_id: int
     model_id: int
     original_filename: str
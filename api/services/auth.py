@@ -10,6 +10,7 @@ Authentication services for user registration, login, and API key management
 
 import hashlib
 import secrets
+from datetime import datetime
 from typing import Optional, Tuple
 
 from core import constants
@@ -22,12 +23,12 @@ async def register_user(username: str, password: str) -> None:
     """
     Handles user registration.
     """
-    if postgres_utils.get_user_by_username(username=username):
-        raise ValueError(constants.AuthErrorMessage.USERNAME_EXISTS)
-
     hashed_pw = password_utils.get_password_hash(password=password)
     user = postgres_utils.set_user(username=username, password_hash=hashed_pw)
-    logger.info(f"User registered: {username} (ID: {user['id']})")
+    if not user:
+        raise ValueError(constants.AuthErrorMessage.USERNAME_EXISTS)
+
+    logger.info("User registered: %s (ID: %s)", username, user["id"])
 
 
 async def login_user(username: str, password: str) -> Tuple[str, str]:
@@ -39,13 +40,13 @@ async def login_user(username: str, password: str) -> Tuple[str, str]:
     if not user or not password_utils.verify_password(
         plain_password=password, hashed_password=user["password_hash"]
     ):
-        logger.warning(f"Failed login attempt for username: {username}")
+        logger.warning("Failed login attempt for username: %s", username)
         raise ValueError(constants.AuthErrorMessage.INVALID_CREDENTIALS)
 
     # Create both tokens for the session
     access_token = jwt_utils.create_access_token(identity=username)
     refresh_token = jwt_utils.create_refresh_token(identity=username)
-    logger.info(f"User login: {username} (ID: {user['id']})")
+    logger.info("User login: %s (ID: %s)", username, user["id"])
 
     return access_token, refresh_token
 
@@ -80,7 +81,7 @@ async def refresh_tokens(refresh_token: str) -> Tuple[str, str, str]:
     new_access_token = jwt_utils.create_access_token(identity=username)
     new_refresh_token = jwt_utils.create_refresh_token(identity=username)
 
-    logger.info(f"Token refreshed for user: {username}")
+    logger.info("Token refreshed for user: %s", username)
 
     return new_access_token, new_refresh_token, username
 
@@ -91,13 +92,13 @@ async def logout_user(username: str) -> None:
     """
     user = postgres_utils.get_user_by_username(username=username)
     if user:
-        logger.info(f"User logout: {username} (ID: {user['id']})")
+        logger.info("User logout: %s (ID: %s)", username, user["id"])
 
 
 async def create_api_key(
     username: str,
     name: str = "default",
-    expires_at: Optional[str] = None,
+    expires_at: Optional[datetime] = None,
 ) -> str:
     """
     Generates a new API key for the authenticated user and stores its hash.
@@ -108,20 +109,19 @@ async def create_api_key(
     if not user:
         raise ValueError(constants.AuthErrorMessage.INVALID_SESSION)
 
-    # Check if API key name already exists for this user
-    if postgres_utils.get_apikey_by_name(user_id=user["id"], name=name):
-        raise ValueError(constants.AuthErrorMessage.API_KEY_EXISTS.format(name))
-
     raw_key = secrets.token_urlsafe(32)
     hashed_key = hashlib.sha256(raw_key.encode()).hexdigest()
 
-    postgres_utils.set_apikey(
+    # Insert fails softly if the API key name already exists for this user
+    api_key = postgres_utils.set_apikey(
         user_id=user["id"],
         hashed_key=hashed_key,
         name=name,
         expires_at=expires_at,
     )
+    if not api_key:
+        raise ValueError(constants.AuthErrorMessage.API_KEY_EXISTS.format(name))
 
-    logger.info(f"API key '{name}' created for user {username} (ID: {user['id']})")
+    logger.info("API key '%s' created for user %s (ID: %s)", name, username, user["id"])
 
     return raw_key
@@ -29,7 +29,7 @@ async def start_inference(
     slide_db = postgres_utils.get_slide_by_id(slide_id=slide_id, owner_id=user_id)
     if not slide_db:
         logger.warning(
-            f"Unauthorized inference attempt for slide {slide_id} by user {user_id}"
+            "Unauthorized inference attempt for slide %s by user %s", slide_id, user_id
         )
         raise ValueError(constants.ErrorMessage.RESOURCE_NOT_FOUND)
 
@@ -47,7 +47,10 @@ async def start_inference(
 
     # Call inference service
     logger.info(
-        f"Starting inference for slide {slide_id} by user {user_id} (confidence: {confidence})"
+        "Starting inference for slide %s by user %s (confidence: %s)",
+        slide_id,
+        user_id,
+        confidence,
     )
 
     async with httpx.AsyncClient() as client:
@@ -71,7 +74,10 @@ async def start_inference(
         )
 
         logger.info(
-            f"Inference task created: {task['id']} for slide {slide_id} by user {user_id}"
+            "Inference task created: %s for slide %s by user %s",
+            task["id"],
+            slide_id,
+            user_id,
         )
 
         # Return in format expected by our schema
@@ -100,7 +106,10 @@ async def get_tasks(
     )
 
     logger.info(
-        f"Tasks retrieved: {len(tasks)} tasks for user {user_id} (filter: {state or 'all'})"
+        "Tasks retrieved: %s tasks for user %s (filter: %s)",
+        len(tasks),
+        user_id,
+        state or "all",
     )
 
     # Format tasks for response
@@ -132,12 +141,17 @@ async def get_task_status(task_id: str, user_id: int) -> Dict[str, Any]:
     task = postgres_utils.get_task_by_id(task_id=task_id_int, user_id=user_id)
     if not task:
         logger.warning(
-            f"Unauthorized task status access attempt for task {task_id_int} by user {user_id}"
+            "Unauthorized task status access attempt for task %s by user %s",
+            task_id_int,
+            user_id,
         )
         raise ValueError(constants.ErrorMessage.RESOURCE_NOT_FOUND)
 
     logger.info(
-        f"Task status checked: {task_id_int} (state: {task['state']}) by user {user_id}"
+        "Task status checked: %s (state: %s) by user %s",
+        task_id_int,
+        task["state"],
+        user_id,
     )
 
     # Return in format expected by our schema
@@ -166,7 +180,9 @@ async def cancel_task(task_id: str, user_id: int) -> Dict[str, Any]:
     task = postgres_utils.get_task_by_id(task_id=task_id_int, user_id=user_id)
     if not task:
         logger.warning(
-            f"Unauthorized task cancel attempt for task {task_id_int} by user {user_id}"
+            "Unauthorized task cancel attempt for task %s by user %s",
+            task_id_int,
+            user_id,
         )
         raise ValueError(constants.ErrorMessage.RESOURCE_NOT_FOUND)
 
@@ -197,11 +213,14 @@ async def cancel_task(task_id: str, user_id: int) -> Dict[str, Any]:
         user_id=user_id,
         state=data["state"],  # Will be "REVOKED" from the inference service
         message=constants.TaskMessage.CANCELLED,
-        completed_at=sys_utils.get_utc_timestamp(),
+        completed_at=sys_utils.get_utc_datetime(),
     )
 
     logger.info(
-        f"Task cancelled: {task_id_int} for slide {task['slide_id']} by user {user_id}"
+        "Task cancelled: %s for slide %s by user %s",
+        task_id_int,
+        task["slide_id"],
+        user_id,
     )
 
     return {
@@ -221,14 +240,16 @@ async def get_task_predictions(task_id: int, user_id: int) -> Dict[str, Any]:
 
     if not task:
         logger.warning(
-            f"Unauthorized predictions access attempt for task {task_id} by user {user_id}"
+            "Unauthorized predictions access attempt for task %s by user %s",
+            task_id,
+            user_id,
         )
         raise ValueError(constants.ErrorMessage.RESOURCE_NOT_FOUND)
 
     # Check if task completed successfully
     if task["state"] != constants.TaskState.SUCCESS:
         logger.warning(
-            f"Predictions requested for task {task_id} in state {task['state']}"
+            "Predictions requested for task %s in state %s", task_id, task["state"]
         )
         raise ValueError(constants.ErrorMessage.INVALID_STATE)
 
@@ -247,8 +268,8 @@ async def get_task_predictions(task_id: int, user_id: int) -> Dict[str, Any]:
     ext = slide_db["type"]
     # Ensure slide is also available locally to get dimensions
     slide_path = await slide_utils.ensure_slide_local_async(slide_id=slide_id, ext=ext)
-    _, full_width, full_height, _, _ = slide_utils.get_slide_info_cached(
-        slide_path=slide_path
+    _, full_width, full_height, _, _, _ = (
+        await slide_utils.get_slide_info_cached_async(slide_path=slide_path)
     )
     results = slide_utils.load_inference_file(pkl_path=pkl_path)
 
@@ -275,7 +296,10 @@ async def get_task_predictions(task_id: int, user_id: int) -> Dict[str, Any]:
         )
 
     logger.info(
-        f"Predictions accessed for task {task_id} by user {user_id} ({len(segments)} segments)"
+        "Predictions accessed for task %s by user %s (%s segments)",
+        task_id,
+        user_id,
+        len(segments),
     )
 
     return {
@@ -301,28 +325,28 @@ async def handle_webhook_callback(
 
     # Verify the request is from inference service
     if api_key != config.settings.inference_api_key:
-        logger.warning(f"Unauthorized webhook attempt with invalid API key")
+        logger.warning("Unauthorized webhook attempt with invalid API key")
         raise ValueError(constants.ErrorMessage.UNAUTHORIZED)
 
-    # Convert webhook timestamp to ISO format for consistency
-    iso_timestamp = sys_utils.get_utc_timestamp()
+    # Record when the callback was received (stored as TIMESTAMPTZ)
+    received_at = sys_utils.get_utc_datetime()
 
     # Update task status
     updated = postgres_utils.update_task_by_inference_task_id(
         inference_task_id=inference_task_id,
         state=state,
         message=message,
-        completed_at=iso_timestamp,
+        completed_at=received_at,
     )
 
     if not updated:
         raise ValueError(constants.ErrorMessage.RESOURCE_NOT_FOUND)
 
-    logger.info(f"Webhook received: task {inference_task_id} updated to {state}")
+    logger.info("Webhook received: task %s updated to %s", inference_task_id, state)
 
     return {
         "inference_task_id": inference_task_id,
         "state": state,
         "message": constants.TaskMessage.STATUS_UPDATED,
-        "received_at": iso_timestamp,
+        "received_at": received_at,
     }
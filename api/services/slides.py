@@ -18,12 +18,16 @@ from utils import aws_utils, logging_utils, postgres_utils, sys_utils
 logger = logging_utils.get_logger("cytolens.services.slides")
 
 
-async def get_slides(user_id: int) -> List[dict]:
+async def get_slides(
+    user_id: int,
+    limit: int = constants.Defaults.SLIDE_LIMIT,
+    offset: int = constants.Defaults.SLIDE_OFFSET,
+) -> List[dict]:
     """
-    Get all slides for a specific user.
+    Get a page of slides for a specific user.
     """
-    slides = postgres_utils.get_slides(owner_id=user_id)
-    logger.info(f"Slides accessed: {len(slides)} slides retrieved by user {user_id}")
+    slides = postgres_utils.get_slides(owner_id=user_id, limit=limit, offset=offset)
+    logger.info("Slides accessed: %s slides retrieved by user %s", len(slides), user_id)
     return slides
 
 
@@ -36,11 +40,13 @@ async def get_slide(slide_id: int, user_id: int) -> Dict:
 
     if not slide:
         logger.warning(
-            f"Unauthorized slide access attempt for slide {slide_id} by user {user_id}"
+            "Unauthorized slide access attempt for slide %s by user %s",
+            slide_id,
+            user_id,
         )
         raise ValueError(constants.ErrorMessage.RESOURCE_NOT_FOUND)
 
-    logger.info(f"Slide accessed: {slide_id} by user {user_id}")
+    logger.info("Slide accessed: %s by user %s", slide_id, user_id)
     return slide
 
 
@@ -53,7 +59,10 @@ async def get_slide_tasks(slide_id: int, user_id: int) -> List[Dict]:
     tasks = postgres_utils.get_tasks_by_slide(slide_id=slide_id, user_id=user_id)
 
     logger.info(
-        f"Slide tasks accessed: {len(tasks)} tasks for slide {slide_id} by user {user_id}"
+        "Slide tasks accessed: %s tasks for slide %s by user %s",
+        len(tasks),
+        slide_id,
+        user_id,
     )
 
     # Format tasks for response
@@ -91,7 +100,10 @@ async def start_upload(name: str, file_size: int, user_id: int) -> Dict:
         bucket=config.settings.s3_bucket_name, key=s3_key
     )
     logger.info(
-        f"Upload started for slide '{name}' by user {user_id} (upload_id: {upload_id})"
+        "Upload started for slide '%s' by user %s (upload_id: %s)",
+        name,
+        user_id,
+        upload_id,
     )
 
     # Calculate number of parts (100MB per part)
@@ -139,11 +151,6 @@ async def finish_upload(
     if not model:
         raise ValueError(f"Model with id {model_id} does not exist")
 
-    # Check if slide name already exists for this user
-    existing_slide = postgres_utils.get_slide_by_name(name=name, owner_id=user_id)
-    if existing_slide:
-        raise ValueError(f"Slide with name '{name}' already exists")
-
     # Complete S3 multipart upload
     aws_utils.complete_multipart_upload(
         bucket=config.settings.s3_bucket_name,
@@ -158,19 +165,23 @@ async def finish_upload(
     )
 
     # Create slide record
-    created_at = sys_utils.get_utc_timestamp()
-    ext = sys_utils.get_file_ext(filename=filename).replace(".", "")
+    # get_file_ext returns a single leading-dot suffix, e.g. ".svs"
+    ext = sys_utils.get_file_ext(filename=filename)[1:]
 
     slide = postgres_utils.set_slide(
         name=name,
         model_id=model_id,
         owner_id=user_id,
-        created_at=created_at,
         original_filename=filename,
         type=ext,
         file_size=file_size,
     )
 
+    # Name uniqueness is enforced by the insert; discard the upload on conflict
+    if not slide:
+        aws_utils.delete_file(bucket=config.settings.s3_bucket_name, key=s3_key)
+        raise ValueError(f"Slide with name '{name}' already exists")
+
     # Move from temp to permanent S3 location
     permanent_key = f"{config.settings.s3_slide_folder}/{slide['id']}.{ext}"
 
@@ -180,7 +191,7 @@ async def finish_upload(
 
     aws_utils.delete_file(bucket=config.settings.s3_bucket_name, key=s3_key)
 
-    logger.info(f"Slide uploaded: '{name}' (ID: {slide['id']}) by user {user_id}")
+    logger.info("Slide uploaded: '%s' (ID: %s) by user %s", name, slide["id"], user_id)
 
     return {"slide_id": slide["id"], "status": "ready"}
 
@@ -192,7 +203,7 @@ async def cancel_upload(upload_id: str, s3_key: str) -> Dict:
     aws_utils.abort_multipart_upload(
         bucket=config.settings.s3_bucket_name, key=s3_key, upload_id=upload_id
     )
-    logger.info(f"Upload cancelled: upload_id {upload_id}")
+    logger.info("Upload cancelled: upload_id %s", upload_id)
     return {"status": "aborted"}
 
 
@@ -207,7 +218,7 @@ async def delete_slide(slide_id: int, user_id: int) -> Dict:
 
     if not slide:
         logger.warning(
-            f"Unauthorized delete attempt for slide {slide_id} by user {user_id}"
+            "Unauthorized delete attempt for slide %s by user %s", slide_id, user_id
         )
         raise ValueError(constants.ErrorMessage.RESOURCE_NOT_FOUND)
 
@@ -225,7 +236,7 @@ async def delete_slide(slide_id: int, user_id: int) -> Dict:
 
     # Step 4: Delete slide from local storage (if exists)
     slide_local_path = os.path.join(config.settings.slide_dir, f"{slide_id}.{slide_ext}")
-    sys_utils.delete_local_file(slide_local_path)
+    await sys_utils.delete_local_file_async(slide_local_path)
 
     # Step 5: Get all tasks for this slide to delete their predictions
     tasks = postgres_utils.get_tasks_by_slide(slide_id=slide_id, user_id=user_id)
@@ -251,12 +262,12 @@ async def delete_slide(slide_id: int, user_id: int) -> Dict:
         prediction_local_path = os.path.join(
             config.settings.prediction_dir, f"{inference_task_id}.pkl"
         )
-        sys_utils.delete_local_file(prediction_local_path)
+        await sys_utils.delete_local_file_async(prediction_local_path)
 
     # Step 6: Delete from database (this will cascade delete tasks)
     postgres_utils.delete_slide(slide_id=slide_id, owner_id=user_id)
 
-    logger.info(f"Slide deleted: {slide_id} by user {user_id}")
+    logger.info("Slide deleted: %s by user %s", slide_id, user_id)
 
     # Step 7: Return success message
     return {"message": f"Slide {slide_id} deleted successfully"}
@@ -292,7 +303,7 @@ async def bulk_delete_slides(slide_ids: List[int], user_id: int) -> Dict:
 
         # Delete slide from local storage (if exists)
         slide_local_path = os.path.join(config.settings.slide_dir, f"{slide_id}.{slide_ext}")
-        sys_utils.delete_local_file(slide_local_path)
+        await sys_utils.delete_local_file_async(slide_local_path)
 
         # Get all tasks for this slide to delete their predictions
         tasks = postgres_utils.get_tasks_by_slide(slide_id=slide_id, user_id=user_id)
@@ -318,7 +329,7 @@ async def bulk_delete_slides(slide_ids: List[int], user_id: int) -> Dict:
             prediction_local_path = os.path.join(
                 config.settings.prediction_dir, f"{inference_task_id}.pkl"
             )
-            sys_utils.delete_local_file(prediction_local_path)
+            await sys_utils.delete_local_file_async(prediction_local_path)
 
         # Delete from database
         postgres_utils.delete_slide(slide_id=slide_id, owner_id=user_id)
@@ -326,11 +337,17 @@ async def bulk_delete_slides(slide_ids: List[int], user_id: int) -> Dict:
 
     if deleted_ids:
         logger.info(
-            f"Bulk delete: {len(deleted_ids)} slides deleted by user {user_id} (IDs: {deleted_ids})"
+            "Bulk delete: %s slides deleted by user %s (IDs: %s)",
+            len(deleted_ids),
+            user_id,
+            deleted_ids,
         )
     if failed_ids:
         logger.warning(
-            f"Bulk delete failed: {len(failed_ids)} slides not found for user {user_id} (IDs: {failed_ids})"
+            "Bulk delete failed: %s slides not found for user %s (IDs: %s)",
+            len(failed_ids),
+            user_id,
+            failed_ids,
         )
 
     return {
@@ -351,7 +368,7 @@ async def update_slide(slide_id: int, name: str, user_id: int) -> Dict:
 
     if not slide:
         logger.warning(
-            f"Unauthorized update attempt for slide {slide_id} by user {user_id}"
+            "Unauthorized update attempt for slide %s by user %s", slide_id, user_id
         )
         raise ValueError(constants.ErrorMessage.RESOURCE_NOT_FOUND)
 
@@ -372,6 +389,6 @@ async def update_slide(slide_id: int, name: str, user_id: int) -> Dict:
     if not updated_slide:
         raise ValueError(constants.ErrorMessage.UPDATE_FAILED)
 
-    logger.info(f"Slide updated: {slide_id} renamed to '{name}' by user {user_id}")
+    logger.info("Slide updated: %s renamed to '%s' by user %s", slide_id, name, user_id)
 
     return {"message": f"Slide {slide_id} updated successfully", "slide": updated_slide}
@@ -23,7 +23,7 @@ async def create_dzi(slide_id: int, user_id: int) -> str:
 
     if not slide_db:
         logger.warning(
-            f"Unauthorized DZI access attempt for slide {slide_id} by user {user_id}"
+            "Unauthorized DZI access attempt for slide %s by user %s", slide_id, user_id
         )
         raise ValueError(constants.ErrorMessage.RESOURCE_NOT_FOUND)
 
@@ -31,11 +31,11 @@ async def create_dzi(slide_id: int, user_id: int) -> str:
     # Ensure slide is available locally (download from S3 if needed)
     # Using async version to prevent blocking other requests during download
     slide_path = await slide_utils.ensure_slide_local_async(slide_id=slide_id, ext=ext)
-    _, full_width, full_height, _, _ = slide_utils.get_slide_info_cached(
-        slide_path=slide_path
+    _, full_width, full_height, _, _, _ = (
+        await slide_utils.get_slide_info_cached_async(slide_path=slide_path)
     )
 
-    logger.info(f"DZI accessed for slide {slide_id} by user {user_id}")
+    logger.info("DZI accessed for slide %s by user %s", slide_id, user_id)
 
     # Build the DZI XML descriptor
     xml = (
@@ -62,7 +62,9 @@ async def get_tile(
 
     if not slide_db:
         logger.warning(
-            f"Unauthorized tile access attempt for slide {slide_id} by user {user_id}"
+            "Unauthorized tile access attempt for slide %s by user %s",
+            slide_id,
+            user_id,
         )
         raise ValueError(constants.ErrorMessage.RESOURCE_NOT_FOUND)
 
@@ -70,23 +72,29 @@ async def get_tile(
     # Ensure slide is available locally (download from S3 if needed)
     # Using async version to prevent blocking other requests during download
     slide_path = await slide_utils.ensure_slide_local_async(slide_id=slide_id, ext=ext)
-    slide, full_width, full_height, level_downsamples, dz_dims = (
-        slide_utils.get_slide_info_cached(slide_path=slide_path)
+    slide, full_width, full_height, level_downsamples, dz_dims, dz_params = (
+        await slide_utils.get_slide_info_cached_async(slide_path=slide_path)
     )
 
-    # Render tile using GPU acceleration
-    jpeg_bytes = slide_utils.gpu_render_tile(
+    # Render tile using GPU acceleration off the event loop
+    jpeg_bytes = await slide_utils.gpu_render_tile_async(
         slide=slide,
         full_width=full_width,
         full_height=full_height,
         level_downsamples=level_downsamples,
         dz_dims=dz_dims,
+        dz_params=dz_params,
         level=level,
         col=col,
         row=row,
     )
 
     logger.info(
-        f"Tile accessed for slide {slide_id} (L{level}/{col}_{row}) by user {user_id}"
+        "Tile accessed for slide %s (L%s/%s_%s) by user %s",
+        slide_id,
+        level,
+        col,
+        row,
+        user_id,
     )
     return jpeg_bytes
@@ -40,16 +40,21 @@ class Settings(BaseSettings):
     # Local Storage Settings
     slide_dir: str = "/mnt/nvme_gds/slides"
     prediction_dir: str = "/mnt/nvme_gds/predictions"
+    download_workers: int = 8  # Concurrent S3 downloads (16 ranged GETs each)
 
     # Viewer Settings
     tile_size: int = 512
     tile_overlap: int = 0
     tile_format: str = "jpg"
+    render_workers: int = 4  # Tile render threads, each with its own GPU buffers
 
     # Database Settings
     postgres_user: str
     postgres_password: str
     postgres_db: str
+    init_db: bool = False  # Create missing tables on startup
+    db_pool_size: int = 30  # Persistent pooled connections per worker
+    db_max_overflow: int = 20  # Extra connections allowed under burst load
 
     # JWT Settings
     jwt_secret_key: str
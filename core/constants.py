@@ -58,6 +58,8 @@ class Defaults:
     CONFIDENCE = 0.5
     TASK_LIMIT = 20
     TASK_OFFSET = 0
+    SLIDE_LIMIT = 100
+    SLIDE_OFFSET = 0
 
     # HTTP client timeouts (in seconds)
     INFERENCE_REQUEST_TIMEOUT = 30.0
@@ -22,7 +22,7 @@ from api.routes import inference as inference_routes
 from api.routes import slides as slides_routes
 from api.routes import viewer as viewer_routes
 from core import config
-from utils import logging_utils
+from utils import logging_utils, postgres_utils
 
 
 @asynccontextmanager
@@ -37,6 +37,10 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting CytoLens API Service")
 
+    if config.settings.init_db:
+        postgres_utils.init_db()
+        logger.info("Database tables initialized")
+
     yield
 
     # Shutdown
@@ -0,0 +1,21 @@
+-- Convert legacy ISO-8601 string timestamps to native TIMESTAMPTZ columns.
+-- Existing values were written as UTC ("2025-08-28T05:08:17.123456Z"),
+-- so a direct cast preserves them.
+
+BEGIN;
+
+ALTER TABLE slides
+    ALTER COLUMN created_at TYPE timestamptz USING created_at::timestamptz;
+
+ALTER TABLE reports
+    ALTER COLUMN created_at TYPE timestamptz USING created_at::timestamptz;
+
+ALTER TABLE inference_tasks
+    ALTER COLUMN created_at TYPE timestamptz USING created_at::timestamptz,
+    ALTER COLUMN completed_at TYPE timestamptz USING NULLIF(completed_at, '')::timestamptz;
+
+ALTER TABLE api_keys
+    ALTER COLUMN created_at TYPE timestamptz USING created_at::timestamptz,
+    ALTER COLUMN expires_at TYPE timestamptz USING NULLIF(expires_at, '')::timestamptz;
+
+COMMIT;
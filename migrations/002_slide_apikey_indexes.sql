@@ -0,0 +1,6 @@
+-- Index for the slide listing, newest first per owner.
+-- Per-user API key lookups are served by uq_apikey_name_per_user (003).
+-- CONCURRENTLY cannot run inside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_slide_owner_created
+    ON slides (owner_id, created_at DESC);
@@ -0,0 +1,10 @@
+-- Enforce unique API key names per user so inserts can use
+-- ON CONFLICT (user_id, name). The unique index also covers
+-- per-user lookups, so api_keys needs no separate user_id index.
+
+BEGIN;
+
+ALTER TABLE api_keys
+    ADD CONSTRAINT uq_apikey_name_per_user UNIQUE (user_id, name);
+
+COMMIT;
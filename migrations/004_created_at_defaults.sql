@@ -0,0 +1,15 @@
+-- Let the database stamp created_at on insert and add a BRIN index
+-- for time-range scans over slides. CONCURRENTLY cannot run inside a
+-- transaction block, so the index is created after the COMMIT.
+
+BEGIN;
+
+ALTER TABLE slides ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE api_keys ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE reports ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE inference_tasks ALTER COLUMN created_at SET DEFAULT now();
+
+COMMIT;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_slide_created_brin
+    ON slides USING brin (created_at);
@@ -16,12 +16,28 @@ from botocore.exceptions import ClientError
 
 from core import config
 
-# Use signature v4 for KMS-encrypted buckets
+# Ranged-GET threads per download
+_DOWNLOAD_CONCURRENCY = 16
+
+# Use signature v4 for KMS-encrypted buckets.
+# Every concurrent download can run _DOWNLOAD_CONCURRENCY GETs on this client,
+# so the connection pool covers all of them at once.
 s3_client = boto3.client(
     "s3",
     aws_access_key_id=config.settings.aws_access_key_id,
     aws_secret_access_key=config.settings.aws_secret_access_key,
-    config=Config(signature_version="s3v4"),
+    config=Config(
+        signature_version="s3v4",
+        max_pool_connections=config.settings.download_workers * _DOWNLOAD_CONCURRENCY,
+    ),
+)
+
+# Whole-slide images are hundreds of MB; split them into parallel range GETs
+_DOWNLOAD_CONFIG = TransferConfig(
+    multipart_threshold=32 * 1024**2,  # Files above 32 MB use ranged parts
+    multipart_chunksize=16 * 1024**2,  # Each part = 16 MB
+    max_concurrency=_DOWNLOAD_CONCURRENCY,  # Number of threads
+    use_threads=True,
 )
 
 
@@ -71,15 +87,10 @@ def file_exists(bucket: str, key: str) -> bool:
 def download_file(bucket: str, key: str, local_path: str) -> None:
     """
     Download a file from S3 to a local path.
+    Large objects are fetched as parallel ranged GETs.
     """
-    transfer_config = TransferConfig(
-        multipart_threshold=5 * 1024**3,  # Files above 5 GB use multipart
-        multipart_chunksize=64 * 1024**2,  # Each part = 64 MB
-        max_concurrency=10,  # Number of threads
-    )
-
     s3_client.download_file(
-        Bucket=bucket, Key=key, Filename=local_path, Config=transfer_config
+        Bucket=bucket, Key=key, Filename=local_path, Config=_DOWNLOAD_CONFIG
     )
 
 
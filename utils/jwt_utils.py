@@ -9,7 +9,7 @@ JWT utilities for token creation and validation
 """
 
 import secrets
-from datetime import datetime, timedelta
+import time
 from typing import Optional
 
 from fastapi import Cookie, HTTPException
@@ -17,6 +17,13 @@ from jose import jwt
 
 from core import config
 
+# JWT settings pinned once at import (settings are immutable at runtime)
+_SECRET = config.settings.jwt_secret_key
+_ALGORITHM = config.settings.jwt_algorithm
+_ALGORITHMS = [_ALGORITHM]
+_ACCESS_TTL = config.settings.jwt_access_token_expire_minutes * 60
+_REFRESH_TTL = config.settings.jwt_refresh_token_expire_minutes * 60
+
 
 def create_access_token(identity: str) -> str:
     """
@@ -25,23 +32,19 @@ def create_access_token(identity: str) -> str:
     HIPAA: Access tokens expire in 5 minutes for enhanced security.
     Short-lived tokens minimize risk if compromised.
     """
-    now = datetime.utcnow()
+    now = int(time.time())
 
     # Short expiration for access tokens
-    expire = now + timedelta(minutes=config.settings.jwt_access_token_expire_minutes)
+    expire = now + _ACCESS_TTL
 
     to_encode = {
         "sub": identity,
         "exp": expire,
-        "iat": now.timestamp(),
+        "iat": now,
         "type": "access",
     }
 
-    encoded_jwt = jwt.encode(
-        to_encode,
-        config.settings.jwt_secret_key,
-        algorithm=config.settings.jwt_algorithm,
-    )
+    encoded_jwt = jwt.encode(to_encode, _SECRET, algorithm=_ALGORITHM)
     return encoded_jwt
 
 
@@ -53,11 +56,11 @@ def create_refresh_token(identity: str) -> str:
     Each refresh resets the inactivity timer - active users stay logged in,
     but inactive users are logged out after 15 minutes.
     """
-    now = datetime.utcnow()
+    now = int(time.time())
 
     # Refresh token expires after inactivity period
     # Gets renewed with each refresh, so active users never get logged out
-    expire = now + timedelta(minutes=config.settings.jwt_refresh_token_expire_minutes)
+    expire = now + _REFRESH_TTL
 
     # Generate unique token ID for revocation support
     token_id = secrets.token_urlsafe(32)
@@ -65,16 +68,12 @@ def create_refresh_token(identity: str) -> str:
     to_encode = {
         "sub": identity,
         "exp": expire,  # Sliding window - resets on each refresh
-        "iat": now.timestamp(),
+        "iat": now,
         "jti": token_id,  # JWT ID for revocation
         "type": "refresh",
     }
 
-    encoded_jwt = jwt.encode(
-        to_encode,
-        config.settings.jwt_secret_key,
-        algorithm=config.settings.jwt_algorithm,
-    )
+    encoded_jwt = jwt.encode(to_encode, _SECRET, algorithm=_ALGORITHM)
     return encoded_jwt
 
 
@@ -82,11 +81,7 @@ def decode_token(token: str) -> dict:
     """
     Decode and validate a JWT token.
     """
-    return jwt.decode(
-        token,
-        config.settings.jwt_secret_key,
-        algorithms=[config.settings.jwt_algorithm],
-    )
+    return jwt.decode(token, _SECRET, algorithms=_ALGORITHMS)
 
 
 async def get_current_user(access_token: Optional[str] = Cookie(None)) -> str:
@@ -97,11 +92,7 @@ async def get_current_user(access_token: Optional[str] = Cookie(None)) -> str:
     if not access_token:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    payload = jwt.decode(
-        access_token,
-        config.settings.jwt_secret_key,
-        algorithms=[config.settings.jwt_algorithm],
-    )
+    payload = jwt.decode(access_token, _SECRET, algorithms=_ALGORITHMS)
     username: str = payload.get("sub")
     if username is None:
         raise HTTPException(
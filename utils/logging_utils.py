@@ -84,5 +84,9 @@ def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance with the given name.
     Use module's __name__ for consistency.
+
+    Pass values as arguments (logger.info("Slide %s", slide_id)) instead of
+    f-strings so messages are only formatted when the level is enabled.
+    Enforced by the G001/G004 rules in ruff.toml.
     """
     return logging.getLogger(name)
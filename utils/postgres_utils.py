@@ -9,10 +9,12 @@ PostgreSQL database utilities and models
 """
 
 from contextlib import contextmanager
+from datetime import datetime
 
 from sqlalchemy import (
     BigInteger,
     Column,
+    DateTime,
     Float,
     ForeignKey,
     Index,
@@ -21,23 +23,39 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
     create_engine,
+    func,
+    inspect as sa_inspect,
+    literal,
+    select,
+    update,
 )
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, scoped_session, sessionmaker
+from sqlalchemy.orm import relationship, sessionmaker
 
 from core import config, constants
-from utils import sys_utils
 
 # Database connection
 db_uri = config.settings.database_url
 engine = create_engine(
     url=db_uri,
+    pool_size=config.settings.db_pool_size,  # Sized for concurrent tile requests
+    max_overflow=config.settings.db_max_overflow,  # Extra connections under burst
     pool_pre_ping=True,  # Check connection health before using
     pool_recycle=3600,  # Recycle connections after an hour
+    pool_use_lifo=True,  # Reuse hot connections, let idle ones recycle
+    query_cache_size=1200,  # Compiled statement cache entries
+    future=True,
 )
 Base = declarative_base()
 session_factory = sessionmaker(bind=engine)
-session = scoped_session(session_factory)
+
+# Read-only sessions share the pool but run in autocommit mode,
+# so a SELECT needs no BEGIN/COMMIT round-trips
+read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+read_session_factory = sessionmaker(
+    bind=read_engine, autoflush=False, expire_on_commit=False
+)
 
 
 # Models
@@ -60,7 +78,9 @@ class Slide(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String, nullable=False)
-    created_at = Column(String, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
 
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     model_id = Column(Integer, ForeignKey("models.id"), nullable=False)
@@ -72,6 +92,10 @@ class Slide(Base):
     # Enforce unique slide name per user at the DB level
     __table_args__ = (
         UniqueConstraint("owner_id", "name", name="uq_slide_name_per_user"),
+        # Serves get_slides (filter by owner, newest first) without a sort
+        Index("idx_slide_owner_created", owner_id, created_at.desc()),
+        # Compact index for time-range filtering as the table grows
+        Index("idx_slide_created_brin", created_at, postgresql_using="brin"),
     )
 
     # Relationships
@@ -92,8 +116,17 @@ class ApiKey(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     key = Column(String, unique=True, nullable=False)
     name = Column(String, nullable=False)  # user-defined label
-    created_at = Column(String, nullable=False)
-    expires_at = Column(String, nullable=True)  # nullable = never expires
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    expires_at = Column(
+        DateTime(timezone=True), nullable=True
+    )  # nullable = never expires
+
+    # Enforce unique key name per user (also serves per-user lookups)
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name="uq_apikey_name_per_user"),
+    )
 
     # Relationships
     user = relationship("User")
@@ -105,7 +138,9 @@ class Report(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     slide_id = Column(Integer, ForeignKey("slides.id"), nullable=False)
     text = Column(String, nullable=False)
-    created_at = Column(String, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
 
     slide = relationship("Slide", back_populates="report")
 
@@ -138,8 +173,10 @@ class InferenceTask(Base):
     confidence = Column(Float, nullable=True)
 
     # Timestamps
-    created_at = Column(String, nullable=False)
-    completed_at = Column(String, nullable=True)
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    completed_at = Column(DateTime(timezone=True), nullable=True)
 
     # Results and errors
     message = Column(Text, nullable=True)
@@ -155,101 +192,143 @@ class InferenceTask(Base):
     user = relationship("User", back_populates="tasks")
 
 
-# Initialize database tables
-Base.metadata.create_all(engine)
+def init_db() -> None:
+    """
+    Create any missing database tables.
+    Run once at deploy time (python -m utils.postgres_utils) or at startup
+    with INIT_DB=true, rather than on every import of this module.
+    """
+    Base.metadata.create_all(engine)
 
 
-# Context manager for session handling
+# Context managers for session handling
 @contextmanager
 def session_scope():
     """
     Provide a transactional scope for database operations.
-    Ensures the session is properly cleaned up after use.
+    Opens a short-lived session per helper call, so its connection goes
+    back to the pool on commit. Ensures the session is properly cleaned up after use.
     """
+    s = session_factory()
+
     try:
-        yield session  # Provide the session to the caller
-        session.commit()
+        yield s  # Provide the session to the caller
+        s.commit()
     except Exception:
-        session.rollback()  # Roll back the transaction on error
+        s.rollback()  # Roll back the transaction on error
         raise
     finally:
-        session.remove()  # Clean up session resources
+        s.close()
+
+
+@contextmanager
+def read_session():
+    """
+    Provide a session for read-only queries.
+    Runs in autocommit mode, so nothing is committed or rolled back;
+    the connection goes straight back to the pool on close.
+    """
+    s = read_session_factory()
+    try:
+        yield s
+    finally:
+        s.close()
 
 
 # Utility function
+# Mapped column names per model, resolved once for model_to_dict
+_COLUMN_KEYS = {
+    cls: tuple(attr.key for attr in sa_inspect(cls).column_attrs)
+    for cls in (User, Slide, ApiKey, Report, Model, InferenceTask)
+}
+
+
 def model_to_dict(obj):
     """
-    Convert a SQLAlchemy model instance into a dictionary,
-    excluding SQLAlchemy internal attributes.
+    Convert a SQLAlchemy model instance into a dictionary
+    of its loaded column attributes.
     """
-    return {
-        key: value
-        for key, value in vars(obj).items()
-        if not key.startswith("_sa_instance_state")
-    }
+    state = obj.__dict__
+    return {key: state[key] for key in _COLUMN_KEYS[type(obj)] if key in state}
 
 
 # User operations
-def set_user(username: str, password_hash: str, role: str = "user") -> dict:
+def set_user(username: str, password_hash: str, role: str = "user") -> dict | None:
     """
     Create a new user in the database.
+    Returns None if the username is already taken.
     """
     with session_scope() as s:
-        user = User(username=username, password_hash=password_hash, role=role)
-        s.add(user)
-        s.flush()
-        return model_to_dict(user)
+        # Atomic insert; the unique index is the existence check
+        stmt = (
+            insert(User.__table__)
+            .values(username=username, password_hash=password_hash, role=role)
+            .on_conflict_do_nothing(index_elements=["username"])
+            .returning(*User.__table__.c)
+        )
+        row = s.execute(stmt).mappings().first()
+        return dict(row) if row else None
 
 
 def get_user_by_username(username: str) -> dict | None:
     """
     Retrieve a user object by username.
     """
-    with session_scope() as s:
-        user = s.query(User).filter_by(username=username).first()
-        if user:
-            return model_to_dict(user)
-        return None
+    with read_session() as s:
+        row = (
+            s.execute(select(*User.__table__.c).where(User.username == username))
+            .mappings()
+            .first()
+        )
+        return dict(row) if row else None
 
 
 def get_user_by_apikey(hashed_key: str) -> dict | None:
     """
     Return the user associated with the given hashed API key.
     """
-    with session_scope() as s:
-        api_key = s.query(ApiKey).filter_by(key=hashed_key).first()
-        if api_key and api_key.user:
-            return model_to_dict(api_key.user)
+    with read_session() as s:
+        # Single JOIN instead of loading ApiKey and lazy-loading its user
+        user = (
+            s.query(User)
+            .join(ApiKey, ApiKey.user_id == User.id)
+            .filter(ApiKey.key == hashed_key)
+            .first()
+        )
+        if user:
+            return model_to_dict(user)
         return None
 
 
 # ApiKey operations
 def set_apikey(
-    user_id: int, hashed_key: str, name: str, expires_at: str = None
-) -> dict:
+    user_id: int, hashed_key: str, name: str, expires_at: datetime | None = None
+) -> dict | None:
     """
     Create a new API key for a user.
+    Returns None if the user already has a key with this name.
     """
     with session_scope() as s:
-        created_at = sys_utils.get_utc_timestamp()
-        api_key = ApiKey(
-            user_id=user_id,
-            key=hashed_key,
-            name=name,
-            created_at=created_at,
-            expires_at=expires_at,
+        stmt = (
+            insert(ApiKey.__table__)
+            .values(
+                user_id=user_id,
+                key=hashed_key,
+                name=name,
+                expires_at=expires_at,
+            )
+            .on_conflict_do_nothing(index_elements=["user_id", "name"])
+            .returning(*ApiKey.__table__.c)
         )
-
-        s.add(api_key)
-        s.flush()
-        return model_to_dict(api_key)
+        row = s.execute(stmt).mappings().first()
+        return dict(row) if row else None
 
 
 def get_apikey_by_name(user_id: int, name: str) -> dict | None:
     """
     Get an API key by name for a specific user.
     """
-    with session_scope() as s:
+    with read_session() as s:
         api_key = s.query(ApiKey).filter_by(user_id=user_id, name=name).first()
         if api_key:
             return model_to_dict(api_key)
@@ -261,27 +340,30 @@ def set_slide(
     name: str,
     model_id: int,
     owner_id: int,
-    created_at: str,
     original_filename: str,
     type: str,
     file_size: int,
-) -> dict:
+) -> dict | None:
     """
     Insert a new slide into the database.
+    Returns None if the owner already has a slide with this name.
     """
     with session_scope() as s:
-        slide = Slide(
-            name=name,
-            model_id=model_id,
-            owner_id=owner_id,
-            created_at=created_at,
-            original_filename=original_filename,
-            type=type,
-            file_size=file_size,
+        stmt = (
+            insert(Slide.__table__)
+            .values(
+                name=name,
+                model_id=model_id,
+                owner_id=owner_id,
+                original_filename=original_filename,
+                type=type,
+                file_size=file_size,
+            )
+            .on_conflict_do_nothing(index_elements=["owner_id", "name"])
+            .returning(*Slide.__table__.c)  # So slide id is available immediately
         )
-        s.add(slide)
-        s.flush()  # So slide.id is available before commit
-        return model_to_dict(slide)
+        row = s.execute(stmt).mappings().first()
+        return dict(row) if row else None
 
 
 def update_slide(slide_id: int, owner_id: int, **fields_to_update) -> dict | None:
@@ -316,25 +398,37 @@ def get_slide_by_id(slide_id: int, owner_id: int) -> dict | None:
     Retrieve a slide by its ID and owner ID.
     Returns a dict or None if not found or not owned by the user.
     """
-    with session_scope() as s:
-        slide = s.query(Slide).filter_by(id=slide_id, owner_id=owner_id).first()
-        if slide:
-            return model_to_dict(slide)
-        return None
+    with read_session() as s:
+        row = (
+            s.execute(
+                select(*Slide.__table__.c).where(
+                    Slide.id == slide_id, Slide.owner_id == owner_id
+                )
+            )
+            .mappings()
+            .first()
+        )
+        return dict(row) if row else None
 
 
-def get_slides(owner_id: int) -> list:
+def get_slides(
+    owner_id: int,
+    limit: int = constants.Defaults.SLIDE_LIMIT,
+    offset: int = constants.Defaults.SLIDE_OFFSET,
+) -> list:
     """
-    Retrieve all Slide entries associated with a specific user ID.
+    Retrieve a page of Slide entries associated with a specific user ID,
+    most recent first.
     """
-    with session_scope() as s:
-        slides = (
-            s.query(Slide)
-            .filter_by(owner_id=owner_id)
+    with read_session() as s:
+        rows = s.execute(
+            select(*Slide.__table__.c)
+            .where(Slide.owner_id == owner_id)
             .order_by(Slide.created_at.desc())
-            .all()
-        )
-        return [model_to_dict(slide) for slide in slides]
+            .limit(limit)
+            .offset(offset)
+        ).mappings()
+        return [dict(row) for row in rows]
 
 
 def get_slide_by_name(name: str, owner_id: int) -> dict | None:
@@ -342,11 +436,17 @@ def get_slide_by_name(name: str, owner_id: int) -> dict | None:
     Retrieve a slide by its name and owner ID.
     Returns a dict or None if not found.
     """
-    with session_scope() as s:
-        slide = s.query(Slide).filter_by(name=name, owner_id=owner_id).first()
-        if slide:
-            return model_to_dict(slide)
-        return None
+    with read_session() as s:
+        row = (
+            s.execute(
+                select(*Slide.__table__.c).where(
+                    Slide.name == name, Slide.owner_id == owner_id
+                )
+            )
+            .mappings()
+            .first()
+        )
+        return dict(row) if row else None
 
 
 # # Report operations
@@ -438,11 +538,13 @@ def get_model(model_id: int) -> dict:
     """
     Retrieve a single model by its ID.
     """
-    with session_scope() as s:
-        model = s.query(Model).filter_by(id=model_id).first()
-        if model:
-            return model_to_dict(model)
-        return {}
+    with read_session() as s:
+        row = (
+            s.execute(select(*Model.__table__.c).where(Model.id == model_id))
+            .mappings()
+            .first()
+        )
+        return dict(row) if row else {}
 
 
 # Task operations
@@ -450,7 +552,7 @@ def get_task_by_id(task_id: int, user_id: int) -> dict | None:
     """
     Get a task by its internal ID, ensuring user owns the slide.
     """
-    with session_scope() as s:
+    with read_session() as s:
         task = (
             s.query(InferenceTask)
             .join(Slide)
@@ -466,22 +568,27 @@ def update_task(task_id: int, user_id: int, **fields_to_update) -> dict | None:
     """
     Update a task by its internal ID, ensuring user owns the slide.
     """
+    values = {
+        key: value
+        for key, value in fields_to_update.items()
+        if key in InferenceTask.__table__.c
+    }
+
     with session_scope() as s:
-        task = (
-            s.query(InferenceTask)
-            .join(Slide)
-            .filter(InferenceTask.id == task_id, Slide.owner_id == user_id)
-            .first()
+        # Ownership check and update in one statement
+        stmt = (
+            update(InferenceTask.__table__)
+            .where(
+                InferenceTask.id == task_id,
+                InferenceTask.slide_id.in_(
+                    select(Slide.id).where(Slide.owner_id == user_id)
+                ),
+            )
+            .values(**values)
+            .returning(*InferenceTask.__table__.c)
         )
-        if not task:
-            return None
-
-        for key, value in fields_to_update.items():
-            if hasattr(task, key):
-                setattr(task, key, value)
-
-        s.flush()
-        return model_to_dict(task)
+        row = s.execute(stmt).mappings().first()
+        return dict(row) if row else None
 
 
 def update_task_by_inference_task_id(
@@ -517,12 +624,16 @@ def get_tasks(
     """
     Get all tasks for a user with optional filtering.
     """
-    with session_scope() as s:
-        query = s.query(InferenceTask).join(Slide).filter(Slide.owner_id == user_id)
+    with read_session() as s:
+        query = (
+            select(*InferenceTask.__table__.c)
+            .join(Slide)
+            .where(Slide.owner_id == user_id)
+        )
 
         # Apply state filter if provided
         if state:
-            query = query.filter(InferenceTask.state == state)
+            query = query.where(InferenceTask.state == state)
 
         # Order by most recent first
         query = query.order_by(InferenceTask.created_at.desc())
@@ -530,8 +641,10 @@ def get_tasks(
         # Apply pagination
         query = query.limit(limit).offset(offset)
 
-        tasks = query.all()
-        return [model_to_dict(task) for task in tasks]
+        # No yield_per: it needs a server-side cursor, which psycopg2
+        # refuses on the autocommit read connection; limit bounds the rows
+        rows = s.execute(query).mappings()
+        return [dict(row) for row in rows]
 
 
 def get_tasks_by_slide(slide_id: int, user_id: int) -> list:
@@ -539,7 +652,7 @@ def get_tasks_by_slide(slide_id: int, user_id: int) -> list:
     Get all tasks for a specific slide, ensuring user owns the slide.
     Returns empty list if slide not found or not owned.
     """
-    with session_scope() as s:
+    with read_session() as s:
         tasks = (
             s.query(InferenceTask)
             .join(Slide)
@@ -563,22 +676,34 @@ def create_task(
     Returns the task dict or None if slide not found/not owned.
     """
     with session_scope() as s:
-        # Verify slide exists and is owned by user
-        slide = s.query(Slide).filter_by(id=slide_id, owner_id=user_id).first()
-        if not slide:
-            return None
-
-        task = InferenceTask(
-            inference_task_id=inference_task_id,
-            slide_id=slide_id,
-            user_id=user_id,
-            state=state,
-            confidence=confidence,
-            message=message,
-            created_at=sys_utils.get_utc_timestamp(),
+        # INSERT ... SELECT only produces a row if the slide is owned by the user
+        owned_slide = select(
+            literal(inference_task_id, String),
+            Slide.id,
+            literal(user_id, Integer),
+            literal(state, String),
+            literal(confidence, Float),
+            literal(message, Text),
+        ).where(Slide.id == slide_id, Slide.owner_id == user_id)
+
+        stmt = (
+            insert(InferenceTask.__table__)
+            .from_select(
+                [
+                    "inference_task_id",
+                    "slide_id",
+                    "user_id",
+                    "state",
+                    "confidence",
+                    "message",
+                ],
+                owned_slide,
+            )
+            .returning(*InferenceTask.__table__.c)
         )
-        s.add(task)
-        s.flush()
-        return model_to_dict(task)
+        row = s.execute(stmt).mappings().first()
+        return dict(row) if row else None
 
 
+if __name__ == "__main__":
+    init_db()
@@ -9,6 +9,8 @@ Slide processing utilities for Deep Zoom tile generation
 """
 
 import asyncio
+import bisect
+import functools
 import math
 import os
 import pickle
@@ -18,42 +20,166 @@ from typing import Any, Dict, List, Tuple
 
 import cucim
 import cupy as cp
+import numpy as np
+from botocore.exceptions import ClientError
 from cachetools import TTLCache
-from cucim.skimage.transform import resize as cp_resize
 from nvjpeg import NvJpeg
 
 from core import config
 from utils import aws_utils
 
-nj = NvJpeg()
+# Tile edge length, fixed for the lifetime of the process
+TILE_SIZE = config.settings.tile_size
+
+# Relative slack when matching a Deep Zoom scale to a slide pyramid level
+_LEVEL_TOLERANCE = 0.01
+
+# Explicit memory pools so per-tile allocations reuse cached blocks
+cp.cuda.set_allocator(cp.cuda.MemoryPool().malloc)
+cp.cuda.set_pinned_memory_allocator(cp.cuda.PinnedMemoryPool().malloc)
+
+# Per-thread tile state (GPU tile, pinned host buffer, JPEG encoder, stream)
+_tile_buffers = threading.local()
+
+# Fused RGB->BGR flip, resample and zero-pad into a full tile. Downsampling
+# box-filters the source footprint of each output pixel (no aliasing);
+# upsampling is bilinear.
+# Specialized at compile time: RESAMPLE=false when the region already matches
+# the tile, PAD=false for interior tiles that fill the whole TILE_SIZE square.
+_RENDER_TILE_SRC = r"""
+template <bool RESAMPLE, bool PAD>
+__global__ void render_tile(const unsigned char* src, int src_w, int src_h,
+                            int src_c, unsigned char* dst, int tw, int th)
+{
+    int ox = blockDim.x * blockIdx.x + threadIdx.x;
+    int oy = blockDim.y * blockIdx.y + threadIdx.y;
+    if (ox >= TILE_SIZE || oy >= TILE_SIZE) return;
+
+    unsigned char* out = dst + (oy * TILE_SIZE + ox) * 3;
+    if (PAD && (ox >= tw || oy >= th)) {
+        out[0] = 0; out[1] = 0; out[2] = 0;
+        return;
+    }
+
+    if (!RESAMPLE) {
+        const unsigned char* p = src + (oy * src_w + ox) * src_c;
+        out[0] = p[2]; out[1] = p[1]; out[2] = p[0];
+        return;
+    }
+
+    float rx = (float)src_w / tw, ry = (float)src_h / th;
+    if (rx > 1.0f || ry > 1.0f) {
+        // Area average over the source pixels covered by this output pixel
+        int xs = min((int)(ox * rx), src_w - 1);
+        int ys = min((int)(oy * ry), src_h - 1);
+        int xe = max(xs + 1, min(src_w, (int)ceilf((ox + 1) * rx)));
+        int ye = max(ys + 1, min(src_h, (int)ceilf((oy + 1) * ry)));
+        float acc0 = 0.0f, acc1 = 0.0f, acc2 = 0.0f;
+        for (int y = ys; y < ye; ++y) {
+            const unsigned char* row = src + (y * src_w) * src_c;
+            for (int x = xs; x < xe; ++x) {
+                const unsigned char* p = row + x * src_c;
+                acc0 += p[2]; acc1 += p[1]; acc2 += p[0];
+            }
+        }
+        float inv = 1.0f / ((xe - xs) * (ye - ys));
+        out[0] = (unsigned char)(acc0 * inv + 0.5f);
+        out[1] = (unsigned char)(acc1 * inv + 0.5f);
+        out[2] = (unsigned char)(acc2 * inv + 0.5f);
+        return;
+    }
+
+    // Pixel-centre mapping, clamped to the source edges
+    float sx = fminf(fmaxf((ox + 0.5f) * src_w / tw - 0.5f, 0.0f), src_w - 1.0f);
+    float sy = fminf(fmaxf((oy + 0.5f) * src_h / th - 0.5f, 0.0f), src_h - 1.0f);
+    int x0 = (int)sx, y0 = (int)sy;
+    int x1 = min(x0 + 1, src_w - 1), y1 = min(y0 + 1, src_h - 1);
+    float fx = sx - x0, fy = sy - y0;
+
+    const unsigned char* p00 = src + (y0 * src_w + x0) * src_c;
+    const unsigned char* p01 = src + (y0 * src_w + x1) * src_c;
+    const unsigned char* p10 = src + (y1 * src_w + x0) * src_c;
+    const unsigned char* p11 = src + (y1 * src_w + x1) * src_c;
+    for (int c = 0; c < 3; ++c) {
+        int k = 2 - c;
+        float top = p00[k] + (p01[k] - p00[k]) * fx;
+        float bottom = p10[k] + (p11[k] - p10[k]) * fx;
+        out[c] = (unsigned char)(top + (bottom - top) * fy + 0.5f);
+    }
+}
+"""
+_RENDER_TILE_VARIANTS = {
+    (resample, pad): f"render_tile<{str(resample).lower()}, {str(pad).lower()}>"
+    for resample in (True, False)
+    for pad in (True, False)
+}
+_render_tile_module = cp.RawModule(
+    code=_RENDER_TILE_SRC,
+    options=("-std=c++11", "--use_fast_math", f"-DTILE_SIZE={TILE_SIZE}"),
+    name_expressions=tuple(_RENDER_TILE_VARIANTS.values()),
+)
+# (resample, pad) -> compiled kernel
+_RENDER_TILE_KERNELS = {
+    key: _render_tile_module.get_function(name)
+    for key, name in _RENDER_TILE_VARIANTS.items()
+}
+_RENDER_BLOCK = (16, 16)
+_RENDER_GRID = (
+    (TILE_SIZE + _RENDER_BLOCK[0] - 1) // _RENDER_BLOCK[0],
+    (TILE_SIZE + _RENDER_BLOCK[1] - 1) // _RENDER_BLOCK[1],
+)
 
 # Thread pool for blocking I/O operations to prevent blocking the event loop
-_executor = ThreadPoolExecutor(max_workers=4)
+_executor = ThreadPoolExecutor(max_workers=config.settings.download_workers)
+
+# Dedicated pool for tile renders; each thread owns its GPU stream and buffers
+_render_executor = ThreadPoolExecutor(
+    max_workers=config.settings.render_workers, thread_name_prefix="tile-render"
+)
 
 # Production cache with TTL (5 minutes) and max size
 SLIDE_INFO_CACHE = TTLCache(maxsize=50, ttl=300)
-CACHE_LOCK = threading.Lock()  # Thread-safe access
+CACHE_LOCK = threading.Lock()  # Guards cache writes and the load lock table
 
-# Track downloads in progress with asyncio Events for coordination
-_downloads_in_progress = {}  # key -> asyncio.Event
-_downloads_lock = threading.Lock()
+# Per-slide load locks so a cold load only blocks requests for that slide
+_slide_load_locks = {}  # slide_path -> threading.Lock
+
+# Track downloads in progress; only touched from the event loop, so no lock
+_downloads_in_progress: Dict[str, asyncio.Future] = {}  # key -> local path future
+
+# Slide info loads in progress, coalesced on the event loop like downloads
+_slide_loads_in_progress: Dict[str, asyncio.Future] = {}  # slide_path -> info future
 
 
 def _best_slide_level(level_downsamples: List[float], ds_needed: float) -> int:
-    """Find best pyramid level for downsampling."""
-    lvl = 0
-    for i, ds in enumerate(level_downsamples):
-        if ds <= ds_needed:
-            lvl = i
-        else:
-            break
-    return lvl
+    """
+    Find best pyramid level for downsampling (downsamples are ascending).
+    Stored downsamples are rarely exact (e.g. 4.0003 for a 4x level), so a
+    level within _LEVEL_TOLERANCE of the needed factor still qualifies.
+    """
+    target = ds_needed * (1 + _LEVEL_TOLERANCE)
+    return max(bisect.bisect_right(level_downsamples, target) - 1, 0)
+
+
+def _get_tile_buffers() -> Tuple[cp.ndarray, np.ndarray, NvJpeg, cp.cuda.Stream]:
+    """Get this thread's tile buffers, JPEG encoder and CUDA stream."""
+    buffers = getattr(_tile_buffers, "buffers", None)
+    if buffers is None:
+        shape = (TILE_SIZE, TILE_SIZE, 3)
+        tile = cp.empty(shape, dtype=cp.uint8)
+        pinned = cp.cuda.alloc_pinned_memory(tile.nbytes)
+        host = np.frombuffer(pinned, dtype=np.uint8, count=tile.size).reshape(shape)
+        stream = cp.cuda.Stream(non_blocking=True)
+        buffers = _tile_buffers.buffers = (tile, host, NvJpeg(), stream)
+    return buffers
 
 
 def _load_slide_info(
     slide_path: str,
-) -> Tuple[Any, int, int, List[float], List[Tuple[int, int]]]:
-    """Load slide and calculate Deep Zoom dimensions."""
+) -> Tuple[
+    Any, int, int, List[float], List[Tuple[int, int]], List[Tuple[float, float, int]]
+]:
+    """Load slide and calculate Deep Zoom dimensions and per-level parameters."""
     slide = cucim.CuImage(slide_path)
     full_width, full_height = slide.resolutions["level_dimensions"][0]
     level_downsamples = slide.resolutions["level_downsamples"]
@@ -68,7 +194,15 @@ def _load_slide_info(
         h = math.ceil(full_height / scale)
         dz_dims.append((w, h))
 
-    return slide, full_width, full_height, level_downsamples, dz_dims
+    # Per Deep Zoom level: full-resolution pixels per DZ pixel and the
+    # slide pyramid level to read from
+    dz_params = []
+    for w, h in dz_dims:
+        scale_x, scale_y = full_width / w, full_height / h
+        slide_lvl = _best_slide_level(level_downsamples, max(scale_x, scale_y))
+        dz_params.append((scale_x, scale_y, slide_lvl))
+
+    return slide, full_width, full_height, level_downsamples, dz_dims, dz_params
 
 
 def _download_predictions_from_s3(inference_task_id: str) -> str:
@@ -82,14 +216,17 @@ def _download_predictions_from_s3(inference_task_id: str) -> str:
     # Create directory if needed
     os.makedirs(config.settings.prediction_dir, exist_ok=True)
 
-    # Check if exists in S3
-    if not aws_utils.file_exists(bucket=config.settings.s3_bucket_name, key=s3_key):
-        raise ValueError(f"Predictions not found for task {inference_task_id}")
-
-    # Download from S3
-    aws_utils.download_file(
-        bucket=config.settings.s3_bucket_name, key=s3_key, local_path=pkl_path
-    )
+    # Download from S3; a missing object surfaces as a 404 from the transfer
+    try:
+        aws_utils.download_file(
+            bucket=config.settings.s3_bucket_name, key=s3_key, local_path=pkl_path
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+            raise ValueError(
+                f"Predictions not found for task {inference_task_id}"
+            ) from e
+        raise
 
     return pkl_path
 
@@ -105,14 +242,15 @@ def _download_slide_from_s3(slide_id: int, ext: str) -> str:
     # Create directory if needed
     os.makedirs(config.settings.slide_dir, exist_ok=True)
 
-    # Check if exists in S3
-    if not aws_utils.file_exists(bucket=config.settings.s3_bucket_name, key=s3_key):
-        raise ValueError(f"Slide {slide_id} not found in storage")
-
-    # Download from S3
-    aws_utils.download_file(
-        bucket=config.settings.s3_bucket_name, key=s3_key, local_path=local_path
-    )
+    # Download from S3; a missing object surfaces as a 404 from the transfer
+    try:
+        aws_utils.download_file(
+            bucket=config.settings.s3_bucket_name, key=s3_key, local_path=local_path
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+            raise ValueError(f"Slide {slide_id} not found in storage") from e
+        raise
 
     return local_path
 
@@ -123,6 +261,7 @@ def gpu_render_tile(
     full_height: int,
     level_downsamples: List[float],
     dz_dims: List[Tuple[int, int]],
+    dz_params: List[Tuple[float, float, int]],
     level: int,
     col: int,
     row: int,
@@ -132,57 +271,137 @@ def gpu_render_tile(
     if level < 0 or level >= DZ_LEVELS:
         raise ValueError
     lvl_w, lvl_h = dz_dims[level]
-    x, y = col * config.settings.tile_size, row * config.settings.tile_size
+    x, y = col * TILE_SIZE, row * TILE_SIZE
     if x >= lvl_w or y >= lvl_h:
         raise ValueError
 
-    tw, th = min(config.settings.tile_size, lvl_w - x), min(
-        config.settings.tile_size, lvl_h - y
-    )
-    scale_x, scale_y = full_width / lvl_w, full_height / lvl_h
+    tw, th = min(TILE_SIZE, lvl_w - x), min(TILE_SIZE, lvl_h - y)
+    scale_x, scale_y, slide_lvl = dz_params[level]
     bx, by = int(x * scale_x), int(y * scale_y)
-    bw, bh = int(math.ceil(tw * scale_x)), int(math.ceil(th * scale_y))
+    bw, bh = math.ceil(tw * scale_x), math.ceil(th * scale_y)
 
-    slide_lvl = _best_slide_level(level_downsamples, max(scale_x, scale_y))
     ds = level_downsamples[slide_lvl]
-    rw, rh = math.ceil(bw / ds), math.ceil(bh / ds)
+    ids = int(ds)
+    if ids == ds:
+        # Integer downsample (power-of-two pyramids): ceil without floats
+        rw, rh = (bw + ids - 1) // ids, (bh + ids - 1) // ids
+    else:
+        rw, rh = math.ceil(bw / ds), math.ceil(bh / ds)
 
     region = slide.read_region(location=(bx, by), size=(rw, rh), level=slide_lvl)
-    gpu_img = cp.asarray(region)[:, :, ::-1]
-
-    if (gpu_img.shape[1], gpu_img.shape[0]) != (tw, th):
-        gpu_img = cp_resize(gpu_img, output_shape=(th, tw), preserve_range=True).astype(
-            cp.uint8
+    gpu_img, img_cpu, encoder, stream = _get_tile_buffers()
+
+    # All GPU work for this tile is queued on the thread's own stream
+    with stream:
+        src = cp.ascontiguousarray(cp.asarray(region))
+        src_h, src_w, src_c = src.shape
+
+        # Flip, resample and pad straight into the full-size tile buffer
+        kernel = _RENDER_TILE_KERNELS[
+            (src_w, src_h) != (tw, th), tw != TILE_SIZE or th != TILE_SIZE
+        ]
+        kernel(
+            _RENDER_GRID,
+            _RENDER_BLOCK,
+            (
+                src,
+                np.int32(src_w),
+                np.int32(src_h),
+                np.int32(src_c),
+                gpu_img,
+                np.int32(tw),
+                np.int32(th),
+            ),
         )
 
-    if tw != config.settings.tile_size or th != config.settings.tile_size:
-        pad = cp.zeros(
-            (config.settings.tile_size, config.settings.tile_size, 3), dtype=cp.uint8
-        )
-        pad[:th, :tw] = gpu_img
-        gpu_img = pad
+        # Async copy into pinned host memory, then wait once for this stream
+        gpu_img.get(out=img_cpu, stream=stream)
+        stream.synchronize()
 
-    img_cpu = cp.asnumpy(gpu_img)
-    jpeg_bytes = nj.encode(img_cpu, 90)
+    jpeg_bytes = encoder.encode(img_cpu, 90)
     return jpeg_bytes
 
 
+async def gpu_render_tile_async(**tile_args: Any) -> bytes:
+    """
+    Render a tile on the render thread pool without blocking the event loop.
+    Accepts the same keyword arguments as gpu_render_tile.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _render_executor, functools.partial(gpu_render_tile, **tile_args)
+    )
+
+
 def get_slide_info_cached(
     slide_path: str,
-) -> Tuple[Any, int, int, List[float], List[Tuple[int, int]]]:
+) -> Tuple[
+    Any, int, int, List[float], List[Tuple[int, int]], List[Tuple[float, float, int]]
+]:
     """
     Get slide info from cache or load if not cached.
-    Thread-safe with TTL-based expiration.
+    Thread-safe with TTL-based expiration; concurrent misses for the
+    same slide share a single load.
     """
+    # Fast path: cache hit without taking any lock
+    try:
+        return SLIDE_INFO_CACHE[slide_path]
+    except KeyError:
+        pass
+
+    # Claim the per-slide lock under a brief global lock
     with CACHE_LOCK:
-        # Try to get from cache
-        if slide_path in SLIDE_INFO_CACHE:
+        load_lock = _slide_load_locks.setdefault(slide_path, threading.Lock())
+
+    with load_lock:
+        # Another request may have loaded the slide while we waited
+        try:
             return SLIDE_INFO_CACHE[slide_path]
+        except KeyError:
+            pass
 
-        # Cache miss - load the slide
-        slide_info = _load_slide_info(slide_path)
-        SLIDE_INFO_CACHE[slide_path] = slide_info
-        return slide_info
+        try:
+            slide_info = _load_slide_info(slide_path)
+            with CACHE_LOCK:
+                SLIDE_INFO_CACHE[slide_path] = slide_info
+            return slide_info
+        finally:
+            # Waiters still hold a reference; later misses get a fresh lock.
+            # Only drop our own lock, never a newer one a later miss created.
+            with CACHE_LOCK:
+                if _slide_load_locks.get(slide_path) is load_lock:
+                    del _slide_load_locks[slide_path]
+
+
+async def get_slide_info_cached_async(
+    slide_path: str,
+) -> Tuple[
+    Any, int, int, List[float], List[Tuple[int, int]], List[Tuple[float, float, int]]
+]:
+    """
+    Async version of get_slide_info_cached for request handlers.
+    Cache hits return inline; concurrent misses for a slide share one load,
+    so a cold slide occupies a single I/O pool thread however many requests
+    are waiting on it.
+    """
+    try:
+        return SLIDE_INFO_CACHE[slide_path]
+    except KeyError:
+        pass
+
+    # shield() keeps a cancelled waiter from cancelling the shared load
+    load = _slide_loads_in_progress.get(slide_path)
+    if load is not None:
+        return await asyncio.shield(load)
+
+    loop = asyncio.get_running_loop()
+    load = loop.run_in_executor(_executor, get_slide_info_cached, slide_path)
+    _slide_loads_in_progress[slide_path] = load
+
+    # Forget the load once it settles so a failure can be retried
+    load.add_done_callback(lambda _: _slide_loads_in_progress.pop(slide_path, None))
+
+    return await asyncio.shield(load)
 
 
 def get_cache_info() -> Dict[str, Any]:
@@ -228,59 +447,22 @@ async def ensure_slide_local_async(slide_id: int, ext: str) -> str:
     # Coordinate with other potential downloads of the same slide
     download_key = f"slide_{slide_id}_{ext}"
 
-    # Determine if we should download or wait for another request's download
-    download_event = None
-    i_should_download = False
-
-    with _downloads_lock:
-        if download_key in _downloads_in_progress:
-            # Another request is already downloading this slide
-            download_event = _downloads_in_progress[download_key]
-        else:
-            # We'll download it and let others know when we're done
-            download_event = asyncio.Event()
-            _downloads_in_progress[download_key] = download_event
-            i_should_download = True
-
-    # Path 1: We're responsible for downloading the slide
-    if i_should_download:
-        try:
-            # Double-check the file doesn't exist (race condition prevention)
-            if not os.path.exists(local_path):
-                # Perform the actual download in a thread pool (non-blocking)
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(
-                    _executor,
-                    _download_slide_from_s3,
-                    slide_id,
-                    ext,
-                )
-
-            # Notify all waiting requests that the download is complete
-            download_event.set()
-            return local_path
-
-        except Exception as e:
-            # Notify waiters even on failure (prevents hanging)
-            download_event.set()
-            raise e
+    # Path 1: another request is already downloading this slide, share its result.
+    # shield() keeps a cancelled waiter from cancelling the shared download.
+    download = _downloads_in_progress.get(download_key)
+    if download is not None:
+        return await asyncio.shield(download)
 
-        finally:
-            # Clean up the download tracker
-            with _downloads_lock:
-                _downloads_in_progress.pop(download_key, None)
+    # Path 2: we're responsible for downloading the slide
+    # Perform the actual download in a thread pool (non-blocking)
+    loop = asyncio.get_running_loop()
+    download = loop.run_in_executor(_executor, _download_slide_from_s3, slide_id, ext)
+    _downloads_in_progress[download_key] = download
 
-    # Path 2: Another request is downloading, we wait for it
-    else:
-        # Wait for the download to complete (async, non-blocking)
-        await download_event.wait()
-
-        # Verify the file now exists
-        if os.path.exists(local_path):
-            return local_path
-        else:
-            # The download failed in the other request
-            raise ValueError(f"Download of slide {slide_id} failed in another request")
+    # Forget the download once it settles so a failure can be retried
+    download.add_done_callback(lambda _: _downloads_in_progress.pop(download_key, None))
+
+    return await asyncio.shield(download)
 
 
 def ensure_predictions_local(inference_task_id: str) -> str:
@@ -8,8 +8,28 @@ via any medium, is strictly prohibited.
 System utilities for file operations and time management
 """
 
+import asyncio
+import ctypes
+import errno
 import os
-from datetime import datetime
+import sys
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Final, List, Optional, Sequence, Union
+
+
+def _ext_after(filename: str, sep: int) -> str:
+    """
+    Lowercased extension of the name that starts after index sep,
+    with the same rules as os.path.splitext.
+    """
+    dot = filename.rfind(".")
+    # No dot in the name, or only leading dots (e.g. ".bashrc")
+    if dot <= sep or filename.count(".", sep + 1, dot) == dot - sep - 1:
+        return ""
+    return filename[dot:].lower()
 
 
 def get_file_ext(filename: str) -> str:
@@ -17,49 +37,183 @@ def get_file_ext(filename: str) -> str:
     Extract and return the file extension
     from the given filename.
     """
-    _, ext = os.path.splitext(filename.lower())
-    return ext
+    sep = max(filename.rfind("/"), filename.rfind("\\"))
+    return _ext_after(filename, sep)
+
+
+def get_basename_ext(filename: str) -> str:
+    """
+    Extract the file extension from a name known to have
+    no directory part (skips the separator search).
+    """
+    return _ext_after(filename, -1)
+
+
+# statx flags from <fcntl.h> / <linux/stat.h>
+_AT_FDCWD = -100
+_AT_STATX_DONT_SYNC = 0x4000
+_AT_SYMLINK_NOFOLLOW = 0x100
+_STATX_SIZE = 0x200
+_STATX_BUF_LEN = 256  # sizeof(struct statx)
+_STATX_SIZE_OFFSET = 40  # offsetof(struct statx, stx_size)
+
+
+def _probe_statx():
+    """
+    Resolve libc's statx (Linux >= 4.11, glibc >= 2.28), or None if unavailable.
+    """
+    try:
+        statx = ctypes.CDLL(None, use_errno=True).statx
+    except (AttributeError, OSError):
+        return None
+    statx.argtypes = [
+        ctypes.c_int,
+        ctypes.c_char_p,
+        ctypes.c_int,
+        ctypes.c_uint,
+        ctypes.c_void_p,
+    ]
+    statx.restype = ctypes.c_int
+    return statx
 
 
-def get_file_size(file_path: str):
+_statx = _probe_statx() if sys.platform.startswith("linux") else None
+
+
+def _statx_size(file_path: str, follow_symlinks: bool) -> Optional[int]:
+    """
+    Read a file's size from cached metadata via statx(AT_STATX_DONT_SYNC).
+    Returns None when statx can't provide it, so the caller uses os.stat.
+    """
+    global _statx
+
+    # Read the global once: another thread may disable statx concurrently
+    statx = _statx
+    if statx is None:
+        return None
+    buf = ctypes.create_string_buffer(_STATX_BUF_LEN)
+    path = os.fsencode(file_path)
+    flags = _AT_STATX_DONT_SYNC
+    if not follow_symlinks:
+        flags |= _AT_SYMLINK_NOFOLLOW
+    if statx(_AT_FDCWD, path, flags, _STATX_SIZE, buf) != 0:
+        err = ctypes.get_errno()
+        if err in (errno.ENOSYS, errno.EPERM):
+            # Unimplemented or blocked (e.g. by seccomp): stop using statx
+            _statx = None
+            return None
+        raise OSError(err, os.strerror(err), file_path)
+
+    # stx_mask (first field) says which requested fields were filled in
+    mask = int.from_bytes(buf.raw[:4], sys.byteorder)
+    if not mask & _STATX_SIZE:
+        return None
+    return int.from_bytes(
+        buf.raw[_STATX_SIZE_OFFSET : _STATX_SIZE_OFFSET + 8], sys.byteorder
+    )
+
+
+def get_file_size(file_path: Union[str, os.DirEntry], follow_symlinks: bool = False):
     """
     Retrieve the size of a file in bytes.
+    Accepts an os.scandir() entry, reusing the stat the entry caches.
+    Uses statx on Linux so only cached metadata is read, else os.stat.
+    Symlinks are not resolved unless follow_symlinks is set.
     """
-    return os.path.getsize(file_path)
+    if isinstance(file_path, os.DirEntry):
+        return file_path.stat(follow_symlinks=follow_symlinks).st_size
+    size = _statx_size(file_path, follow_symlinks)
+    if size is not None:
+        return size
+    return os.stat(file_path, follow_symlinks=follow_symlinks).st_size
 
 
+_UNITS: Final = ("Bytes", "KB", "MB", "GB", "TB", "PB")
+_MAX_I: Final = len(_UNITS) - 1
+# 1 / 1024**i per unit; exact powers of two, so multiplying matches dividing
+_INV: Final = tuple(1.0 / (1 << (10 * i)) for i in range(len(_UNITS)))
+
+
+@lru_cache(maxsize=1024)
 def get_file_size_text(bytes_value: int) -> str:
     """
     Converts the size of a file at the given file path into a more readable unit
     (Bytes, KB, MB, GB, TB, PB).
     """
+    # Largest unit the size strictly exceeds (1024 stays "1024.00 Bytes"):
+    # bytes_value > 1024**i  <=>  (bytes_value - 1).bit_length() > 10 * i
+    i = min((max(bytes_value - 1, 1).bit_length() - 1) // 10, _MAX_I)
+    return f"{bytes_value * _INV[i]:.2f} {_UNITS[i]}"
+
 
-    units = ["Bytes", "KB", "MB", "GB", "TB", "PB"]
-    size = bytes_value
-    i = 0
+def get_file_sizes_text(bytes_values: Sequence[int]) -> List[str]:
+    """
+    Vectorized get_file_size_text for formatting many sizes at once.
+    """
+    # Imported here so the rest of this module doesn't load numpy
+    import numpy as np
 
-    while size > 1024 and i < len(units) - 1:
-        size /= 1024
-        i += 1
+    values = np.asarray(bytes_values, dtype=np.int64)
+    # frexp's exponent equals bit_length for positive integers
+    _, bit_length = np.frexp(np.maximum(values - 1, 1).astype(np.float64))
+    i = np.minimum((bit_length - 1) // 10, _MAX_I)
+    sizes = values * np.asarray(_INV)[i]
+    units = np.asarray(_UNITS)[i]
+    return [f"{size:.2f} {unit}" for size, unit in zip(sizes.tolist(), units.tolist())]
 
-    return f"{size:.2f} {units[i]}"
+
+# Bound once at import; avoids the attribute lookups on every call
+_time_ns = time.time_ns
+_localtime = time.localtime
+
+# Legacy time formats indexed by the milliseconds flag (False -> 0, True -> 1),
+# filled from a struct_time and the microseconds:
+# strftime("%Y/%m/%d %H:%M:%S") and strftime("%Y_%m_%d_%H_%M_%S_%f")
+_TIME_FORMATS = (
+    "{0.tm_year:04d}/{0.tm_mon:02d}/{0.tm_mday:02d} "
+    "{0.tm_hour:02d}:{0.tm_min:02d}:{0.tm_sec:02d}",
+    "{0.tm_year:04d}_{0.tm_mon:02d}_{0.tm_mday:02d}_"
+    "{0.tm_hour:02d}_{0.tm_min:02d}_{0.tm_sec:02d}_{1:06d}",
+)
 
 
 def get_current_time(milliseconds=False) -> str:
     """
     Gets current time (legacy format for file names and IDs)
+    Formatted from time.localtime fields, without building a datetime.
+    """
+    # Integer nanoseconds: exact microseconds, no float rounding
+    second, ns = divmod(_time_ns(), 1_000_000_000)
+    return _TIME_FORMATS[milliseconds].format(_localtime(second), ns // 1000)
+
+
+# Last (second, formatted time) seen in this context, for get_current_time_cached
+_time_cache: ContextVar[tuple[int, str]] = ContextVar("time_cache", default=(-1, ""))
+
+
+def get_current_time_cached(milliseconds=False) -> str:
+    """
+    Same as get_current_time, but reuses the formatted string within the
+    current context (e.g. one request) until the wall-clock second changes.
+    Millisecond stamps are always fresh since they are used as unique IDs.
     """
     if milliseconds:
-        return datetime.now().strftime("%Y_%m_%d_%H_%M_%S_%f")
-    return datetime.now().strftime("%Y/%m/%d %H:%M:%S")
+        return get_current_time(milliseconds=True)
+
+    second = _time_ns() // 1_000_000_000
+    cached_second, text = _time_cache.get()
+    if cached_second != second:
+        text = _TIME_FORMATS[0].format(_localtime(second))
+        _time_cache.set((second, text))
+    return text
 
 
-def get_utc_timestamp() -> str:
+def get_utc_datetime() -> datetime:
     """
-    Gets current UTC timestamp in ISO 8601 format for database storage
-    Returns: String like "2025-08-28T05:08:17Z"
+    Gets current timezone-aware UTC datetime for database storage
+    (TIMESTAMPTZ columns)
     """
-    return datetime.utcnow().isoformat() + "Z"
+    return datetime.now(timezone.utc)
 
 
 def delete_local_file(file_path: str) -> bool:
@@ -67,7 +221,16 @@ def delete_local_file(file_path: str) -> bool:
     Delete a file from local storage if it exists.
     Returns True if file was deleted, False if file didn't exist.
     """
-    if os.path.exists(file_path):
+    try:
         os.remove(file_path)
         return True
-    return False
+    except FileNotFoundError:
+        return False
+
+
+async def delete_local_file_async(file_path: str) -> bool:
+    """
+    Same as delete_local_file, but runs the unlink in a worker thread
+    so async request handlers don't block the event loop.
+    """
+    return await asyncio.to_thread(delete_local_file, file_path)